@@ -1,6 +1,16 @@
 import enum
 
-from construct import Enum, Byte, Bytes, PaddedString, Int8sb, Mapping
+from construct import (
+    Byte,
+    Bytes,
+    Enum,
+    Int8sb,
+    Mapping,
+    MappingError,
+    PaddedString,
+    stream_read,
+)
+from construct.core import EnumInteger
 
 __all__ = (
     'ANIM',
@@ -1285,14 +1295,57 @@ PLUSTIMESTAMP = {
 }
 
 
-BIN_DISCONNECTMESSAGE = Mapping(Byte, DISCONNECT_MESSAGES)
+# Single-byte enums and mappings decode through a table indexed by the byte
+# instead of a dictionary lookup behind a separately parsed Byte.
+class ByteEnum(Enum):
+    def __init__(self, *merge, **mapping):
+        super().__init__(Byte, *merge, **mapping)
+        self.dectable = tuple(
+            self.decmapping.get(value, EnumInteger(value))
+            for value in range(256)
+        )
+
+    def _parse(self, stream, context, path):
+        return self.dectable[stream_read(stream, 1, path)[0]]
+
+    def _decode(self, obj, context, path):
+        return self.dectable[obj]
+
+    def _emitparse(self, code):
+        fname = f'factory_{code.allocateId()}'
+        entries = ', '.join(
+            repr(entry) if value in self.decmapping else f'EnumInteger({value})'
+            for value, entry in enumerate(self.dectable)
+        )
+        code.append(f'{fname} = ({entries})')
+        return f"{fname}[stream_read(io, 1, '(parsing)')[0]]"
+
+
+class ByteMapping(Mapping):
+    def __init__(self, mapping):
+        super().__init__(Byte, mapping)
+        self.dectable = tuple(map(self.decmapping.get, range(256)))
+
+    def _parse(self, stream, context, path):
+        return self._decode(stream_read(stream, 1, path)[0], context, path)
+
+    def _decode(self, obj, context, path):
+        decoded = self.dectable[obj]
+        if decoded is None:
+            raise MappingError(
+                'parsing failed, no decoding mapping for %r' % (obj,), path=path
+            )
+        return decoded
+
+
+BIN_DISCONNECTMESSAGE = ByteMapping(DISCONNECT_MESSAGES)
 BIN_VERSIONSTRING = Mapping(PaddedString(4, 'ascii'), VERSIONSTRING)
-BIN_CHAR = Enum(Byte, CHARACTER)
-BIN_TEAM = Enum(Byte, TEAM)
-BIN_GAMEMODE = Enum(Byte, GAME.MODE)
-BIN_CUSTOM = Enum(Byte, GAME.CUSTOM)
-BIN_GAMEEVENT = Enum(Byte, GAMEEVENT)
-BIN_CHAT = Enum(Byte, CHAT)
+BIN_CHAR = ByteEnum(CHARACTER)
+BIN_TEAM = ByteEnum(TEAM)
+BIN_GAMEMODE = ByteEnum(GAME.MODE)
+BIN_CUSTOM = ByteEnum(GAME.CUSTOM)
+BIN_GAMEEVENT = ByteEnum(GAMEEVENT)
+BIN_CHAT = ByteEnum(CHAT)
 BIN_SPECTATETARGET = Enum(Int8sb, SPECTATETARGET)
 BIN_PLUSTIMESTAMP = Mapping(Bytes(6), PLUSTIMESTAMP)
 
@@ -1,15 +1,14 @@
 from __future__ import annotations
 
 import abc
+import operator
 import reprlib
-import weakref
 from typing import ClassVar, Any
 
 
 class Payload(abc.ABC):
     event: str | None = None
     feeds: str | None = None
-    _supports_protocols: weakref.WeakSet
 
     def __init__(self, **data):
         self._data = data
@@ -57,19 +56,6 @@ class Payload(abc.ABC):
     def from_dict(cls, data):
         return cls(**data)
 
-    @classmethod
-    def on_register(
-            cls, protocol_cls=None, payload_cls=None, protocol_supported=True
-    ):
-        if payload_cls:
-            cls._supports_protocols = payload_cls._supports_protocols
-        if protocol_cls:
-            if protocol_supported:
-                cls._supports_protocols.add(protocol_cls)
-            else:
-                cls._supports_protocols.discard(protocol_cls)
-        return protocol_supported
-
     @abc.abstractmethod
     def _serialize(self, context, **kwargs):
         pass
@@ -81,7 +67,6 @@ class Payload(abc.ABC):
     def __init_subclass__(cls, feeds=True):
         if feeds and cls.feeds is None:
             cls.feeds = cls.__name__
-        cls._supports_protocols = weakref.WeakSet()
 
     @reprlib.recursive_repr()
     def __repr__(self):
@@ -94,6 +79,7 @@ class Payload(abc.ABC):
 
 class AbstractPayload(Payload, abc.ABC, has_feed=False):
     impls: ClassVar[dict]
+    impl_table: ClassVar[list]
     impl_spec: tuple[type[Payload], Any]
     feeds = None
     has_default_implementation = None
@@ -145,7 +131,12 @@ class AbstractPayload(Payload, abc.ABC, has_feed=False):
         return impl
 
     def pick(self, context):
-        impl = self.impls.get(self._get_impl_key(context))
+        impl = None
+        table = self.impl_table
+        if table:
+            key = self._get_impl_key(context)
+            if 0 <= key < len(table):
+                impl = table[key]
         if impl is None and not self.has_default_implementation:
             raise NotImplementedError(
                 'not implemented for '
@@ -163,12 +154,20 @@ class AbstractPayload(Payload, abc.ABC, has_feed=False):
     def __init_subclass__(cls, feeds=True):
         super().__init_subclass__(feeds=feeds)
         cls.impls = {}
+        cls.impl_table = []
 
     @classmethod
     def register(cls, value):
+        key = operator.index(value)
+        if key < 0:
+            raise ValueError(f'implementation key must not be negative: {value!r}')
+
         def _register_impl(payload_cls):
             cls.impls[value] = payload_cls
+            table = cls.impl_table
+            if key >= len(table):
+                table.extend([None] * (key + 1 - len(table)))
+            table[key] = payload_cls
             payload_cls.impl_spec = (cls, value)
-            payload_cls.on_register(payload_cls=cls)
             return payload_cls
         return _register_impl
@@ -69,17 +69,21 @@ class If:
     def __init__(self, check):
         self._check = check
         self.checks_payload = False
+        self.checks_config = False
 
     @classmethod
     def configured(cls, **config_conditions):
         def _check(proto, _payload):
+            config = proto._config
             for key, cond in config_conditions.items():
-                value = proto.config.get(key)
+                value = config.get(key)
                 if not _condition_check(value, cond):
                     return False
             return True
 
-        return cls(_check)
+        self = cls(_check)
+        self.checks_config = True
+        return self
 
     @classmethod
     def has(cls, **schema_conditions):
@@ -108,7 +112,8 @@ class If:
         return bool(self._check)
 
     def __and__(self, other):
-        return type(self)(
+        return self._combine(
+            other,
             lambda proto, payload: (
                 self.check(proto, payload)
                 and other.check(proto, payload)
@@ -116,13 +121,26 @@ class If:
         )
 
     def __or__(self, other):
-        return type(self)(
+        return self._combine(
+            other,
             lambda proto, payload: (
                 self.check(proto, payload)
                 or other.check(proto, payload)
             )
         )
 
+    def _combine(self, other, check):
+        combined = type(self)(check)
+        combined.checks_payload = self.checks_payload or other.checks_payload
+        combined.checks_config = self.checks_config and other.checks_config
+        return combined
+
+
+def _walk_impls(payload_cls):
+    yield payload_cls
+    for impl_cls in getattr(payload_cls, 'impls', {}).values():
+        yield from _walk_impls(impl_cls)
+
 
 class Protocol:
     feeds: ClassVar[Any]
@@ -139,6 +157,8 @@ class Protocol:
         self._config = {}
         self.children = {}
         self.registry = []
+        self.supported_payloads = frozenset()
+        self.config_checks = {}
         self.configure(**config)
         self._aborted = False
 
@@ -150,6 +170,15 @@ class Protocol:
         self._config.update(config)
         registry = []
 
+        # Handler conditions on the configuration alone have the same outcome
+        # for every payload, so they are resolved here and looked up later.
+        self.config_checks = {
+            condition: condition.check(self, None)
+            for conditional_cases in self._handlers.values()
+            for condition in conditional_cases
+            if condition is not None and condition.checks_config
+        }
+
         for payload_cls, condition in self._registry.items():
             abort_on_check_failure = payload_cls is ALL_PAYLOADS
             if condition is None:
@@ -158,29 +187,31 @@ class Protocol:
                 check = condition.check(self, None)
 
             if check:
-                payload_cls.on_register(
-                    protocol_cls=self,
-                    protocol_supported=True
-                )
-            else:
-                payload_cls.on_register(
-                    protocol_cls=self,
-                    protocol_supported=False
-                )
-                if abort_on_check_failure:
-                    self._aborted = True
-                    break
+                if not abort_on_check_failure:
+                    registry.append(payload_cls)
+            elif abort_on_check_failure:
+                self._aborted = True
+                break
 
         for child_cls in self._children:
             if child_cls not in self.children:
                 self.children[child_cls] = child_cls(self, **self._config)
 
         self.registry = registry
+        # Conditions only depend on the configuration, so resolve them here
+        # once instead of on every handled payload.
+        self.supported_payloads = frozenset(
+            impl_cls
+            for payload_cls in registry
+            for impl_cls in _walk_impls(payload_cls)
+        )
 
     @classmethod
     def register(cls, registered=None, condition=None):
         if registered is None:
-            return functools.partial(cls.register, condition=condition)
+            def _register(payload_cls):
+                return cls.register(payload_cls, condition=condition)
+            return _register
         if issubclass(registered, Payload):
             checks_payload = False
             if condition:
@@ -237,10 +268,11 @@ class Protocol:
         if self._aborted:
             return
 
-        if self not in payload._supports_protocols:
+        if type(payload) not in self.supported_payloads:
             return self.on_unknown_case(payload)
 
         handlers = []
+        config_checks = self.config_checks
 
         for conditional_cases in (
             self._handlers.get(type(payload), {}),
@@ -250,7 +282,9 @@ class Protocol:
                 if condition is None:
                     check = True
                 else:
-                    check = condition.check(self, payload)  # type: ignore
+                    check = config_checks.get(condition)
+                    if check is None:
+                        check = condition.check(self, payload)  # type: ignore
                 if check:
                     for case in cases:
                         function = case.pop('function')
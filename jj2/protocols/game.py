@@ -1,8 +1,12 @@
 import abc
 import asyncio
+import codecs
 import dataclasses
 import functools
+import io
 import random
+import struct as pystruct
+import zlib
 from typing import Literal
 
 from construct import (
@@ -10,7 +14,6 @@ from construct import (
     Bytes,
     GreedyBytes,
     Struct,
-    PascalString,
     this,
     Switch,
     Int,
@@ -19,22 +22,26 @@ from construct import (
     PrefixedArray,
     Short,
     Default,
-    CString,
     GreedyRange,
     Int32ul,
     Int16ul,
-    GreedyString,
     Int8sb,
-    Bitwise,
-    BitsSwapped,
     Array,
     If as ConstructIf,
     BitStruct,
     Padding,
     Flag,
     Renamed,
+    Adapter,
+    Compiled,
+    Construct,
+    StreamError,
+    Container,
+    ListContainer,
+    stream_read,
+    stream_read_entire,
+    stream_write,
 )
-from construct import possiblestringencodings
 
 from jj2.lib import (
     AbstractPayload,
@@ -385,7 +392,107 @@ class Player(Object):
 
 
 MAIN_ENCODING = "cp1250"
-possiblestringencodings[MAIN_ENCODING] = 1
+
+_decode_main = codecs.getdecoder(MAIN_ENCODING)
+_encode_main = codecs.getencoder(MAIN_ENCODING)
+
+_INT16UL = pystruct.Struct("<H")
+_pack_int16ul = _INT16UL.pack
+_unpack_int16ul_from = _INT16UL.unpack_from
+_INT32UL = pystruct.Struct("<I")
+_pack_int32ul = _INT32UL.pack
+_unpack_int32ul_from = _INT32UL.unpack_from
+# Latencies are sent as big-endian shorts of which only the high byte is used.
+_LATENCY_RECORD = pystruct.Struct(">BBx")
+
+
+# zlib.adler32 keeps the same two running sums as the JJ2 checksum, only
+# modulo 65521. Resuming from sums below 251, no 21 bytes can reach that
+# modulus, so the exact sums can be folded modulo 251 after every block.
+_CHECKSUM_BLOCK = 21
+
+
+def _fletcher251(buffer):
+    if len(buffer) <= _CHECKSUM_BLOCK:
+        # Most gameplay datagrams fit in a single block.
+        sums = zlib.adler32(buffer, 1)
+        return (sums & 0xFFFF) % 251, ((sums >> 16) + 1) % 251
+    view = memoryview(buffer)
+    lsb, msb = 1, 0
+    for offset in range(0, len(view), _CHECKSUM_BLOCK):
+        sums = zlib.adler32(view[offset:offset + _CHECKSUM_BLOCK], msb << 16 | lsb)
+        lsb = (sums & 0xFFFF) % 251
+        msb = (sums >> 16) % 251
+    return lsb, (msb + 1) % 251
+
+
+class PascalText(Construct):
+    # PascalString(Byte, MAIN_ENCODING) with the codec resolved once.
+    def _parse(self, stream, context, path):
+        length = stream_read(stream, 1, path)[0]
+        return _decode_main(stream_read(stream, length, path))[0]
+
+    def _build(self, obj, stream, context, path):
+        data = _encode_main(obj)[0]
+        stream_write(stream, bytes((len(data),)) + data, len(data) + 1, path)
+        return obj
+
+    def _emitparse(self, code):
+        code.append(_MAIN_CODEC_SOURCE)
+        return (
+            "_decode_main(stream_read(io, stream_read(io, 1, '(parsing)')[0],"
+            " '(parsing)'))[0]"
+        )
+
+
+class GreedyText(Construct):
+    # GreedyString(MAIN_ENCODING) with the codec resolved once.
+    def _parse(self, stream, context, path):
+        return _decode_main(stream_read_entire(stream, path))[0]
+
+    def _build(self, obj, stream, context, path):
+        data = _encode_main(obj)[0]
+        stream_write(stream, data, len(data), path)
+        return obj
+
+    def _emitparse(self, code):
+        code.append(_MAIN_CODEC_SOURCE)
+        return "_decode_main(io.read())[0]"
+
+
+_CSTRING_CHUNK = 32
+
+
+def _read_cstring(stream, path):
+    # Reads ahead in chunks and seeks back to just past the terminator
+    # instead of reading one byte at a time.
+    data = b""
+    while True:
+        chunk = stream.read(_CSTRING_CHUNK)
+        end = chunk.find(0)
+        if end >= 0:
+            stream.seek(end + 1 - len(chunk), 1)
+            return data + chunk[:end]
+        if len(chunk) < _CSTRING_CHUNK:
+            raise StreamError("unterminated string", path=path)
+        data += chunk
+
+
+class CText(Construct):
+    # CString(MAIN_ENCODING) with the codec resolved once.
+    def _parse(self, stream, context, path):
+        return _decode_main(_read_cstring(stream, path))[0]
+
+    def _build(self, obj, stream, context, path):
+        data = _encode_main(obj)[0] + b"\0"
+        stream_write(stream, data, len(data), path)
+        return obj
+
+
+_MAIN_CODEC_SOURCE = f"""
+import codecs
+_decode_main = codecs.getdecoder({MAIN_ENCODING!r})
+"""
 
 
 def _cast_to_data(payload_cls, obj):
@@ -396,21 +503,30 @@ def _cast_to_data(payload_cls, obj):
     return obj
 
 
-def _collect_by_struct(payload_cls, subcons, data):
+def _struct_schema(subcons):
+    schema = []
+    for subcon in subcons:
+        has_default = isinstance(subcon, Default) or (
+            isinstance(subcon, Renamed) and isinstance(subcon.subcon, Default)
+        )
+        nested = None
+        if isinstance(subcon, Struct):
+            nested = _struct_schema(subcon.subcons)
+        schema.append((subcon.name, has_default, nested))
+    return tuple(schema)
+
+
+def _collect_by_struct(payload_cls, schema, data):
     result = {}
     if data is None:
         return result
-    for subcon in subcons:
-        value = _cast_to_data(payload_cls, data.get(subcon.name))
-        if (
-            value is None
-            and isinstance(subcon, Default)
-            or (isinstance(subcon, Renamed) and isinstance(subcon.subcon, Default))
-        ):
+    for name, has_default, nested in schema:
+        value = _cast_to_data(payload_cls, data.get(name))
+        if value is None and has_default:
             continue
-        if isinstance(subcon, Struct):
-            value = _collect_by_struct(payload_cls, subcon.subcons, value)
-        result[subcon.name] = value
+        if nested is not None:
+            value = _collect_by_struct(payload_cls, nested, value)
+        result[name] = value
     return result
 
 
@@ -424,30 +540,188 @@ def struct(*args, **kwargs):
     return obj
 
 
+def _is_trivial_struct(subcons):
+    if len(subcons) <= 1:
+        return True
+    return all(getattr(subcon, "subcon", subcon) in (Byte, Pass) for subcon in subcons)
+
+
+def _serialize_empty(self, context, **kwargs):
+    return b""
+
+
+def _deserialize_empty(self, serialized, context, **kwargs):
+    return {}
+
+
+def _fixed_fields(subcons):
+    fields = []
+    for subcon in subcons:
+        field = getattr(subcon, "subcon", subcon)
+        if field is Byte:
+            count = 1
+        elif (
+            isinstance(field, Array)
+            and field.subcon is Byte
+            and isinstance(field.count, int)
+        ):
+            count = field.count
+        else:
+            return None
+        fields.append((subcon.name, count))
+    return tuple(fields)
+
+
+def _fixed_codec(fields, fixed_struct):
+    # Generates straight-line pack/unpack functions for a fixed layout, so
+    # that no per-field loop runs for every packet.
+    args = []
+    items = []
+    offset = 0
+    for name, count in fields:
+        if count == 1:
+            args.append(f"data[{name!r}]")
+            items.append(f"{name!r}: values[{offset}]")
+        else:
+            args.append(f"*data[{name!r}]")
+            items.append(f"{name!r}: list(values[{offset}:{offset + count}])")
+        offset += count
+    source = (
+        f"def pack(data):\n"
+        f"    return _pack({', '.join(args)})\n"
+        f"def unpack(serialized):\n"
+        f"    values = _unpack_from(serialized)\n"
+        f"    return {{{', '.join(items)}}}\n"
+    )
+    namespace = {"_pack": fixed_struct.pack, "_unpack_from": fixed_struct.unpack_from}
+    exec(source, namespace)
+    return namespace["pack"], namespace["unpack"]
+
+
+def _serialize_fixed(self, context, **kwargs):
+    try:
+        return self._pack_fixed(self.data(deserialization=False))
+    except Exception as exc:
+        raise PayloadException(self.event or "unknown event") from exc
+
+
+def _deserialize_fixed(self, serialized, context, **kwargs):
+    try:
+        return self._unpack_fixed(serialized)
+    except pystruct.error as exc:
+        raise PayloadException(self.event or "unknown event") from exc
+
+
+def _serialize_constant(self, context=None, standalone=False, **kwargs):
+    # Payloads without fields always produce the same frame.
+    key = (standalone, tuple(sorted(kwargs.items())))
+    frame = self.constant_frames.get(key)
+    if frame is None:
+        frame = AbstractPayload.serialize(
+            self, context, standalone=standalone, **kwargs
+        )
+        self.constant_frames[key] = frame
+    return frame
+
+
+# Compiled parsers only read the context they are given and build their own
+# on top of it, so one root context can serve every parse.
+_PARSE_CONTEXT = Container(_parsing=True, _building=False, _sizing=False)
+_PARSE_CONTEXT._params = _PARSE_CONTEXT
+
+
+def _compiled_parse(compiled):
+    parsefunc = compiled.parsefunc
+
+    def _struct_parse(serialized, **kwargs):
+        if kwargs:
+            return compiled.parse(serialized, **kwargs)
+        return parsefunc(io.BytesIO(serialized), _PARSE_CONTEXT)
+
+    return staticmethod(_struct_parse)
+
+
+def _compiling_parse(payload_cls):
+    # Structs are compiled on the first parse, so that payloads a process
+    # never receives do not cost a compilation at import.
+    def _struct_parse(serialized, **kwargs):
+        payload_cls.compile_struct()
+        return payload_cls._struct_parse(serialized, **kwargs)
+
+    return staticmethod(_struct_parse)
+
+
 class BinaryPayload(AbstractPayload, abc.ABC, has_feed=False):
     struct = struct(buffer=GreedyBytes)
     feeds = "buffer"
     has_default_implementation = True
 
+    _struct_build = struct.build
+    _struct_parse = struct.parse
+
     def _serialize(self, context, **kwargs):
         try:
-            return self.struct.build(self.data(deserialization=False), **kwargs)
+            return self._struct_build(self.data(deserialization=False), **kwargs)
         except Exception as exc:
             raise PayloadException(self.event or "unknown event") from exc
 
     def _deserialize(self, serialized, context, **kwargs):
         try:
-            return self.struct.parse(serialized, **kwargs)
+            return self._struct_parse(serialized, **kwargs)
         except Exception as exc:
             raise PayloadException(self.event or "unknown event") from exc
 
     @classmethod
     def from_dict(cls, data):
-        return cls(**_collect_by_struct(cls, cls.struct.subcons, data))
+        return cls(**_collect_by_struct(cls, cls.schema, data))
 
-    def __init_subclass__(cls, compiled_structs=False, feeds=None):
-        if compiled_structs and cls.struct is not None:
+    @classmethod
+    def compile_struct(cls):
+        if cls.compile_pending:
             cls.struct = cls.struct.compile()
+            cls._struct_parse = _compiled_parse(cls.struct)
+            cls.compile_pending = False
+
+    def __init_subclass__(cls, compiled_structs=True, fixed_layout=False, feeds=None):
+        if cls.struct is not None:
+            if isinstance(cls.struct, Compiled):
+                subcons = cls.struct.defersubcon.subcons
+            else:
+                subcons = cls.struct.subcons
+            cls.schema = _struct_schema(subcons)
+            if not subcons:
+                cls._serialize = _serialize_empty
+                cls._deserialize = _deserialize_empty
+                cls.serialize = _serialize_constant
+                cls.constant_frames = {}
+            elif fixed_layout:
+                fixed_fields = _fixed_fields(subcons)
+                if fixed_fields is None:
+                    raise TypeError(
+                        f"{cls.__name__} struct is not made of bytes and byte arrays"
+                    )
+                cls.fixed_fields = fixed_fields
+                cls.fixed_struct = pystruct.Struct(
+                    "<" + "".join(f"{count}B" for _, count in fixed_fields)
+                )
+                pack, unpack = _fixed_codec(fixed_fields, cls.fixed_struct)
+                cls._pack_fixed = staticmethod(pack)
+                cls._unpack_fixed = staticmethod(unpack)
+                cls._serialize = _serialize_fixed
+                cls._deserialize = _deserialize_fixed
+            cls._struct_build = cls.struct.build
+            cls._struct_parse = cls.struct.parse
+            cls.compile_pending = False
+            if isinstance(cls.struct, Compiled):
+                cls._struct_parse = _compiled_parse(cls.struct)
+            elif (
+                compiled_structs
+                # Payloads with their own _deserialize never parse the struct.
+                and cls._deserialize is BinaryPayload._deserialize
+                and not _is_trivial_struct(subcons)
+            ):
+                cls._struct_parse = _compiling_parse(cls)
+                cls.compile_pending = True
         if feeds:
             cls.feeds = feeds
         super().__init_subclass__()
@@ -466,6 +740,21 @@ class GamePayload(BinaryPayload):
     def _impl_data(self, deserialization=False):
         return self._data["buffer"]
 
+    def _serialize(self, context, **kwargs):
+        # The frame is just the packet id followed by the already built buffer.
+        try:
+            return bytes((self._data["packet_id"],)) + self._data["buffer"]
+        except Exception as exc:
+            raise PayloadException(self.event or "unknown event") from exc
+
+    def _deserialize(self, serialized, context, **kwargs):
+        # Accepts any bytes-like frame; the body stays a view of it, since
+        # received frames are never reused or mutated once handed over.
+        try:
+            return {"packet_id": serialized[0], "buffer": memoryview(serialized)[1:]}
+        except Exception as exc:
+            raise PayloadException(self.event or "unknown event") from exc
+
     def serialize(self, context=None, checksum=False, **kwargs) -> bytes:
         if self.serialized is None:
             serialized = super().serialize(context, **kwargs)
@@ -476,34 +765,30 @@ class GamePayload(BinaryPayload):
 
     @staticmethod
     def checksum(serialized):
-        arr = bytes((79, 79)) + serialized
-        lsb = msb = 1
-        for i in range(2, len(arr)):
-            lsb += arr[i]
-            msb += lsb
-        return Byte.build(lsb % 251) + Byte.build(msb % 251)
+        # The b"OO" checksum placeholder is never part of the sums.
+        return bytes(_fletcher251(serialized))
 
     @classmethod
     def load(cls, serialized, context=None, checksum=None, **options):
         if checksum is not None:
-            if cls.checksum(serialized) != checksum:
-                self = None
             serialized = serialized[2:]
-        self = super().load(serialized=serialized, context=context, **options)
-        return self
+            # Without a packet id there is nothing to verify or dispatch.
+            if not serialized or _fletcher251(serialized) != tuple(checksum):
+                return None
+        return super().load(serialized=serialized, context=context, **options)
 
 
 packet_id = GamePayload.register
 
 
 @packet_id(0x03)
-class Ping(BinaryPayload):
+class Ping(BinaryPayload, fixed_layout=True):
     event = "ping"
     struct = struct(number_in_list=Byte, unknown_data=Byte[4], client_version=Byte[4])
 
 
 @packet_id(0x04)
-class Pong(BinaryPayload):
+class Pong(BinaryPayload, fixed_layout=True):
     event = "pong"
     struct = struct(
         number_in_list_from_ping=Byte, unknown_data=Byte[4], game_mode_etc=Byte
@@ -511,7 +796,7 @@ class Pong(BinaryPayload):
 
 
 @packet_id(0x05)
-class Query(BinaryPayload):
+class Query(BinaryPayload, fixed_layout=True):
     event = "query"
     struct = struct(number_in_list=Byte)
 
@@ -529,7 +814,7 @@ class QueryReply(BinaryPayload):
         unknown_data_2=Byte,
         game_mode=BIN_GAMEMODE,
         player_limit=Byte,
-        server_name=PascalString(Byte, MAIN_ENCODING),
+        server_name=PascalText(),
         unknown_data_3=Byte,
     )
 
@@ -552,7 +837,7 @@ class Heartbeat(BinaryPayload):
 # @packet_id(0x0A)
 class Password(BinaryPayload):
     event = "password"
-    struct = struct(password=PascalString(Byte, MAIN_ENCODING))
+    struct = struct(password=PascalText())
 
 
 # @packet_id(0x0B)
@@ -569,28 +854,101 @@ class ClientDisconnect(BinaryPayload):
         client_id=Int8sb,
         client_version=BIN_VERSIONSTRING,
         include_reason=Optional(Flag),
-        reason=ConstructIf(this.include_reason, PascalString(Byte, MAIN_ENCODING)),
+        reason=ConstructIf(this.include_reason, PascalText()),
     )
 
 
+_PLAYER_FIXED = pystruct.Struct("<13B")
+_PLAYER_FIXED_WITH_CLIENT_ID = pystruct.Struct("<14B")
+_PLAYER_HEADER_COLUMNS = (
+    (0, "client_id"),
+    (1, "player_id"),
+    (2, "team"),
+    (3, "character"),
+    (8, "sprite_mode"),
+    (9, "sprite_mode_param"),
+    (10, "light_type"),
+    (11, "light_size"),
+    (12, "antigrav_and_nofire"),
+    (13, "unused"),
+)
+
+
+class PlayerRecord(Construct):
+    # Parses the 13 (or 14) leading single-byte fields with one unpack
+    # instead of a sub-parser call each; building goes through the struct.
+    def __init__(self, subcon, *, client_id):
+        super().__init__()
+        self.subcon = subcon
+        self.fixed = _PLAYER_FIXED_WITH_CLIENT_ID if client_id else _PLAYER_FIXED
+        self.client_id = client_id
+
+    def _parse(self, stream, context, path):
+        values = self.fixed.unpack(stream_read(stream, self.fixed.size, path))
+        obj = Container()
+        if self.client_id:
+            obj.client_id, *values = values
+        obj.player_id = values[0]
+        obj.team = BIN_TEAM._decode(values[1], context, path)
+        obj.character = BIN_CHAR._decode(values[2], context, path)
+        obj.fur_colour = ListContainer(values[3:7])
+        (
+            obj.sprite_mode,
+            obj.sprite_mode_param,
+            obj.light_type,
+            obj.light_size,
+            obj.antigrav_and_nofire,
+            obj.unused,
+        ) = values[7:]
+        obj.rabbit_name = _decode_main(_read_cstring(stream, path))[0]
+        return obj
+
+    def _build(self, obj, stream, context, path):
+        return self.subcon._build(obj, stream, context, path)
+
+    def _sizeof(self, context, path):
+        return self.subcon._sizeof(context, path)
+
+
+_PLAYER_FIELDS = dict(
+    player_id=Byte,
+    team=Default(BIN_TEAM, TEAM.BLUE.value),
+    character=Default(BIN_CHAR, CHARACTER.SPAZ.value),
+    fur_colour=Byte[4],
+    sprite_mode=Default(Byte, 1),
+    sprite_mode_param=Default(Byte, this.player_id),
+    light_type=Default(Byte, 13),
+    light_size=Default(Byte, 0),
+    antigrav_and_nofire=Default(Byte, 0),
+    unused=Default(Byte, 0),
+    rabbit_name=CText(),
+)
+
+
+@functools.lru_cache(maxsize=None)
 def player_array(*, client_id):
     subcons = {}
     if client_id:
         subcons.update(client_id=Byte)
-    subcons.update(
-        player_id=Byte,
-        team=Default(BIN_TEAM, TEAM.BLUE.value),
-        character=Default(BIN_CHAR, CHARACTER.SPAZ.value),
-        fur_colour=Byte[4],
-        sprite_mode=Default(Byte, 1),
-        sprite_mode_param=Default(Byte, this.player_id),
-        light_type=Default(Byte, 13),
-        light_size=Default(Byte, 0),
-        antigrav_and_nofire=Default(Byte, 0),
-        unused=Default(Byte, 0),
-        rabbit_name=CString(MAIN_ENCODING),
-    )
-    return struct(**subcons)
+    subcons.update(_PLAYER_FIELDS)
+    return PlayerRecord(struct(**subcons), client_id=client_id)
+
+
+class LatencyRecords(Adapter):
+    def _decode(self, obj, context, path):
+        end = len(obj) - len(obj) % _LATENCY_RECORD.size
+        return [
+            dict(player_id=player_id, latency=latency)
+            for player_id, latency in _LATENCY_RECORD.iter_unpack(
+                memoryview(obj)[:end]
+            )
+        ]
+
+    def _encode(self, obj, context, path):
+        return b"".join(
+            _LATENCY_RECORD.pack(details["player_id"], details["latency"])
+            for details in obj
+        )
 
 
 @packet_id(0x0E)
@@ -617,7 +975,7 @@ class ServerDetails(BinaryPayload):
     struct = struct(
         client_id=Byte,
         unknown=Byte,
-        level_file_name=PascalString(Byte, MAIN_ENCODING),
+        level_file_name=PascalText(),
         level_crc=Int,
         tileset_crc=Int,
         game_mode=BIN_GAMEMODE,
@@ -662,6 +1020,32 @@ class PlayerList(BinaryPayload):
         players=GreedyRange(player_array(client_id=True)),
     )
 
+    def players_soa(self):
+        # Records are a fixed 14-byte header followed by a NUL-terminated
+        # name, so the packet body is split once and each byte-sized column
+        # is a strided slice of the concatenated headers.
+        body = self.deserialized_from
+        if body is None:
+            body = self.serialize(standalone=True)
+        body = bytes(body)
+        size = _PLAYER_FIXED_WITH_CLIENT_ID.size
+        headers = []
+        names = []
+        offset = 1  # number_of_players
+        while offset + size < len(body):
+            end = body.find(0, offset + size)
+            if end < 0:
+                break
+            headers.append(body[offset:offset + size])
+            names.append(_decode_main(body[offset + size:end])[0])
+            offset = end + 1
+        fur_colour = b"".join(header[4:8] for header in headers)
+        headers = b"".join(headers)
+        columns = {name: headers[index::size] for index, name in _PLAYER_HEADER_COLUMNS}
+        columns["fur_colour"] = fur_colour
+        columns["rabbit_name"] = names
+        return columns
+
 
 @packet_id(0x13)
 class GameInit(BinaryPayload):
@@ -676,6 +1060,9 @@ class DownloadingFile(BinaryPayload):
     def _get_impl_key(self, context):
         return context.get("is_downloading", False)
 
+    def _impl_data(self, deserialization=False):
+        return self._data["buffer"]
+
 
 @DownloadingFile.register(False)
 class _DownloadingFileInit(BinaryPayload):
@@ -683,7 +1070,7 @@ class _DownloadingFileInit(BinaryPayload):
     struct = struct(
         packet_count=Int32ul,
         unknown_data=Byte[4],
-        file_name=PascalString(Byte, MAIN_ENCODING),
+        file_name=PascalText(),
     )
 
 
@@ -692,11 +1079,26 @@ class _DownloadingFileChunk(BinaryPayload):
     event = "downloading_file"
     struct = struct(packet_count=Int32ul, file_content=GreedyBytes)
 
+    # Chunks carry most of the transferred bytes, so skip Construct for them.
+    def _serialize(self, context, **kwargs):
+        try:
+            data = self._data
+            return _pack_int32ul(data["packet_count"]) + data["file_content"]
+        except Exception as exc:
+            raise PayloadException(self.event or "unknown event") from exc
+
+    def _deserialize(self, serialized, context, **kwargs):
+        try:
+            (packet_count,) = _unpack_int32ul_from(serialized)
+        except pystruct.error as exc:
+            raise PayloadException(self.event or "unknown event") from exc
+        return {"packet_count": packet_count, "file_content": bytes(serialized[4:])}
+
 
 @packet_id(0x15)
 class DownloadRequest(BinaryPayload):
     event = "download_request"
-    struct = struct(file_name=PascalString(Byte, MAIN_ENCODING))
+    struct = struct(file_name=PascalText())
 
 
 @packet_id(0x16)
@@ -705,7 +1107,7 @@ class LevelLoad(BinaryPayload):
     struct = struct(
         level_crc=Int,
         tileset_crc=Int,
-        level_file_name=PascalString(Byte, MAIN_ENCODING),
+        level_file_name=PascalText(),
         level_challenge=Byte[4],
         is_different=Flag,
         music=Byte,
@@ -726,7 +1128,7 @@ class UpdateEvents(BinaryPayload):
     struct = struct(
         checksum=Optional(Short),
         counter=Optional(Short),
-        unknown_data=Optional(GreedyString(MAIN_ENCODING)),
+        unknown_data=Optional(GreedyText()),
     )
 
 
@@ -737,7 +1139,7 @@ class ServerStopped(BinaryPayload):  # rip
 
 
 @packet_id(0x1A)
-class UpdateRequest(BinaryPayload):
+class UpdateRequest(BinaryPayload, fixed_layout=True):
     event = "update_request"
     struct = struct(
         level_challenge=Byte[4],
@@ -750,7 +1152,7 @@ class ChatMessage(BinaryPayload):
     struct = struct(
         client_id=Byte,
         chat_type=BIN_CHAT,
-        text=GreedyString(MAIN_ENCODING),
+        text=GreedyText(),
     )
 
 
@@ -792,7 +1194,7 @@ class ConsoleMessage(BinaryPayload):
     event = "console"
     struct = struct(
         message_type=Byte,
-        content=GreedyString(MAIN_ENCODING)
+        content=GreedyText()
         # content=IfThenElse(
         #     this.message_type == 4,
         #     struct(message=PaddedString(this.length - 5, MAIN_ENCODING), parameters=Bytes(2)),
@@ -815,11 +1217,57 @@ class Spectate(BinaryPayload):
     def _impl_data(self, deserialization=False):
         return self._data["buffer"]
 
+    def _serialize(self, context, **kwargs):
+        try:
+            return bytes((self._data["packet_type"],)) + self._data["buffer"]
+        except Exception as exc:
+            raise PayloadException(self.event or "unknown event") from exc
+
+    def _deserialize(self, serialized, context, **kwargs):
+        try:
+            return {"packet_type": serialized[0], "buffer": memoryview(serialized)[1:]}
+        except Exception as exc:
+            raise PayloadException(self.event or "unknown event") from exc
+
+
+# Each nibble of the spectator bitmap, most significant bit first, as the
+# b"\x80"/b"\x00" bit-bytes produced by Bitwise(Array(8, BitsSwapped(Bytes(4)))).
+_NIBBLE_BITS = tuple(
+    bytes(0x80 if nibble & (8 >> bit) else 0 for bit in range(4))
+    for nibble in range(16)
+)
+_SPECTATOR_BITS = tuple(
+    (_NIBBLE_BITS[byte >> 4], _NIBBLE_BITS[byte & 0xF]) for byte in range(256)
+)
+
+
+class SpectatorBits(Construct):
+    def _parse(self, stream, context, path):
+        bits = ListContainer()
+        for byte in stream_read(stream, 4, path):
+            bits.extend(_SPECTATOR_BITS[byte])
+        return bits
+
+    def _build(self, obj, stream, context, path):
+        nibbles = [
+            sum(8 >> bit for bit, value in enumerate(item) if value) for item in obj
+        ]
+        if len(nibbles) != 8:
+            raise ValueError(f"expected 8 spectator nibbles, got {len(nibbles)}")
+        data = bytes(
+            high << 4 | low for high, low in zip(nibbles[::2], nibbles[1::2])
+        )
+        stream_write(stream, data, 4, path)
+        return obj
+
+    def _sizeof(self, context, path):
+        return 4
+
 
 @Spectate.register(0)
 class _SpectatorList(BinaryPayload):
     event = "spectator_list"
-    struct = struct(spectators=Bitwise(Array(8, BitsSwapped(Bytes(4)))))
+    struct = struct(spectators=SpectatorBits())
 
 
 @Spectate.register(1)
@@ -833,7 +1281,7 @@ class _Spectators(BinaryPayload):
 
 
 @packet_id(0x42)
-class SpectateRequest(BinaryPayload):
+class SpectateRequest(BinaryPayload, fixed_layout=True):
     event = "spectate"
     struct = struct(
         spectating=Byte,
@@ -857,14 +1305,20 @@ class GameState(BinaryPayload):
 @packet_id(0x49)
 class Latency(BinaryPayload):
     event = "latencies"
-    struct = struct(latencies=GreedyRange(struct(player_id=Byte, latency=Short)))
-
-    def data(self, deserialization=True, to_impl=False):
-        data = super().data(deserialization, to_impl)
-        if deserialization:
-            for latency_details in data["latencies"]:
-                latency_details["latency"] >>= 8
-        return data
+    struct = struct(latencies=LatencyRecords(GreedyBytes))
+
+    def latencies_soa(self):
+        # Records have a fixed size, so each column is a strided slice of
+        # the packet body and no per-record objects are created.
+        records = self.deserialized_from
+        if records is None:
+            records = self.serialize(standalone=True)
+        size = _LATENCY_RECORD.size
+        end = len(records) - len(records) % size
+        return {
+            "player_id": bytes(records[0:end:size]),
+            "latency": bytes(records[1:end:size]),
+        }
 
 
 @packet_id(0x51)
@@ -882,7 +1336,7 @@ class ResourceList(BinaryPayload):
         scripts=GreedyRange(
             struct(
                 unknown_data=Byte[5],
-                filename=PascalString(Byte, MAIN_ENCODING),
+                filename=PascalText(),
             )
         ),
     )
@@ -894,7 +1348,7 @@ def _setup_registrar_ip(registered, ip):
         _setup_registrar_ip(impl, ip)
 
 
-class GameProtocol(Protocol, asyncio.Protocol, asyncio.DatagramProtocol):
+class GameProtocol(Protocol):
     payload_cls = GamePayload
 
     def __init__(
@@ -912,6 +1366,7 @@ class GameProtocol(Protocol, asyncio.Protocol, asyncio.DatagramProtocol):
         passwords=True,
         spectating=True,
         update_latencies=True,
+        latest_plus=True,
         **config,
     ):
         super().__init__(
@@ -925,13 +1380,16 @@ class GameProtocol(Protocol, asyncio.Protocol, asyncio.DatagramProtocol):
             passwords=passwords,
             spectating=spectating,
             update_latencies=update_latencies,
+            latest_plus=latest_plus,
             **config,
         )
         self.engine = engine
         self.session = Session(self)
         self._future: asyncio.Future = future
         self._deficit = 0
-        self._buffer = bytearray()
+        self._buffer = None
+        self._header = b""
+        self._write_offset = 0
         self._tcp_transport = None
         self._udp_transport = None
         self._udp_addr = None
@@ -940,82 +1398,104 @@ class GameProtocol(Protocol, asyncio.Protocol, asyncio.DatagramProtocol):
     def future(self):
         return self._future
 
-    def connection_made(self, transport):
-        if hasattr(transport, "sendto"):
-            self._udp_transport = transport
-            self._udp_addr, source_port = transport.get_extra_info("sockname", 0)
-            self.session.udp_source_port = source_port
-        else:
-            self._tcp_transport = transport
+    def tcp_connection_made(self, transport):
+        self._tcp_transport = transport
+
+    def udp_connection_made(self, transport):
+        self._udp_transport = transport
+        self._udp_addr, source_port = transport.get_extra_info("sockname", 0)
+        self.session.udp_source_port = source_port
 
     def connection_lost(self, exc=None) -> None:
         self._tcp_transport = None
         self._udp_transport = None
+        self._deficit = 0
+        self._buffer = None
+        self._header = b""
         self.future.cancel()
         self.session.introduced = False
 
     def send(self, data: bytes):
-        length = len(data) + 1
-        arr = bytearray()
-        if length > 255:
-            length += 2
-            lsb = Int16ul.build(length)
-            arr.append(0)
+        length = len(data)
+        if length >= 255:
+            # Long frames: a zero byte, then the body length without the
+            # 3-byte header, as data_received reads it.
+            header = b"\x00" + _pack_int16ul(length)
         else:
-            lsb = length
-        arr.append(lsb)
-        arr.extend(data)
-        return self._tcp_transport.write(arr)
+            header = bytes((length + 1,))
+        return self._tcp_transport.write(header + data)
 
     def sendto(self, data: bytes):
         return self._udp_transport.sendto(data)
 
     def submit(self, payload):
         ip = payload.ip.lower()
-        if ip == "tcp":
-            self.send(payload.serialize(context=self.session))
-        if ip == "udp":
-            self.sendto(payload.serialize(context=self.session, checksum=True))
+        # Only UDP datagrams carry a checksum, TCP frames are length-prefixed.
+        udp = ip == "udp"
+        serialized = payload.serialize(context=self.session, checksum=udp)
+        if udp:
+            self.sendto(serialized)
+        elif ip == "tcp":
+            self.send(serialized)
         return self
 
     def data_received(self, data: bytes):
-        length = eof = len(data)
-        deficit = self._deficit
-
-        if deficit == 0:
-            bof = 1
-            if data[0] == 0:
-                bof += 2
-                elength = Int16ul.parse(data[1:3]) + 3
-            else:
-                elength = data[0]
-            diff = elength - length
-            if diff < 0:
-                eof += diff
-                diff = 0
-            deficit = diff
-        elif deficit > 0:
-            bof = 0
-            if length < deficit:
-                deficit -= length
+        if self._header:
+            data = self._header + data
+            self._header = b""
+        view = memoryview(data)
+        length = len(data)
+        position = 0
+        handle_data = self.handle_data
+        session = self.session
+
+        while position < length:
+            deficit = self._deficit
+
+            if deficit == 0:
+                elength = data[position]
+                if elength:
+                    bof = position + 1
+                else:
+                    bof = position + 3
+                    if bof > length:
+                        # The long length header continues in the next segment.
+                        self._header = bytes(view[position:])
+                        break
+                    elength = _unpack_int16ul_from(data, position + 1)[0] + 3
+                available = length - position
+                if elength <= available:
+                    # Complete frames are handed over as views of the segment.
+                    position += elength
+                    handle_data(view[bof:position], context=session)
+                    continue
+                eof = length
+                deficit = elength - available
+                # The payload may keep a reference to the frame, so never reuse it.
+                self._buffer = bytearray(elength - (bof - position))
+                self._write_offset = 0
+            elif deficit > 0:
+                bof = position
+                eof = position + min(deficit, length - position)
+                deficit -= eof - bof
             else:
-                eof -= deficit
-                deficit = 0
-        else:
-            raise ValueError(f"{deficit=} < 0")
+                raise ValueError(f"{deficit=} < 0")
 
-        self._buffer.extend(data[bof:eof])
-        self._deficit = deficit
+            write_offset = self._write_offset
+            self._write_offset = write_offset + eof - bof
+            self._buffer[write_offset:self._write_offset] = view[bof:eof]
+            self._deficit = deficit
 
-        if deficit == 0:
-            self.handle_data(bytes(self._buffer), context=self.session)
-            self._buffer.clear()
-            if eof < length:
-                tail = data[eof:]
-                self.data_received(tail)
+            if deficit == 0:
+                handle_data(self._buffer, context=session)
+            position = eof
 
     def datagram_received(self, data: bytes, addr: tuple):
-        self.handle_data(data, context=self.session, checksum=data[:2])
+        if len(data) < 2:
+            return
+        self.handle_data(
+            memoryview(data), context=self.session, checksum=(data[0], data[1])
+        )
 
     def eof_received(self):
         self.engine.dispatch(self, "eof")
@@ -1029,7 +1509,9 @@ class GameProtocol(Protocol, asyncio.Protocol, asyncio.DatagramProtocol):
         cls, registered=None, condition=None, *, ip: Literal["tcp", "udp"] = None
     ):
         if registered is None:
-            return functools.partial(cls.register, registered, condition, ip=ip)
+            def _register(payload_cls):
+                return cls.register(payload_cls, condition, ip=ip)
+            return _register
         if ip is None:
             raise ValueError("ip (internet protocol) must be either TCP or UDP")
         registered = super().register(registered, condition)
@@ -1080,37 +1562,61 @@ class GameProtocol(Protocol, asyncio.Protocol, asyncio.DatagramProtocol):
         self.engine.dispatch(self, payload)
 
 
-GameProtocol.register(ChatMessage, If.configured(chat=True), ip="tcp")
-GameProtocol.register(ClientDetails, If.configured(notice_players=True), ip="tcp")
-GameProtocol.register(ClientDisconnect, If.configured(notice_players=True), ip="tcp")
-GameProtocol.register(ConsoleMessage, If.configured(chat=True), ip="tcp")
-GameProtocol.register(DownloadingFile, If.configured(download_files=True), ip="tcp")
-GameProtocol.register(DownloadRequest, If.configured(download_files=True), ip="tcp")
-GameProtocol.register(EndOfLevel, ip="tcp")
-GameProtocol.register(GameEvent, ip="udp")
-GameProtocol.register(GameInit, ip="tcp")
-GameProtocol.register(GameState, ip="udp")
-GameProtocol.register(Heartbeat, ip="udp")
-GameProtocol.register(PlayerList, ip="tcp")
-GameProtocol.register(JoinRequest, ip="tcp")
-GameProtocol.register(Latency, If.configured(update_latencies=True), ip="tcp")
-GameProtocol.register(LevelLoad, ip="tcp")
-# GameProtocol.register(Password, If.configured(passwords=True), ip='udp')
-# GameProtocol.register(PasswordCheck, If.configured(passwords=True), ip='udp')
-GameProtocol.register(Ping, ip="udp")
-GameProtocol.register(PlusAcknowledgement, If.configured(latest_plus=True), ip="tcp")
-GameProtocol.register(Pong, ip="udp")
-GameProtocol.register(Query, ip="udp")
-GameProtocol.register(QueryReply, ip="udp")
-GameProtocol.register(ResourceList, ip="tcp")
-GameProtocol.register(ServerDetails, ip="tcp")
-GameProtocol.register(ServerStopped, ip="tcp")
-GameProtocol.register(Spectate, If.configured(spectating=True), ip="tcp")
-GameProtocol.register(SpectateRequest, If.configured(spectating=True), ip="tcp")
-GameProtocol.register(UpdateEvents, ip="tcp")
-GameProtocol.register(PlayerList, If.configured(notice_players=True), ip="tcp")
-GameProtocol.register(Ready, ip="tcp")
-GameProtocol.register(UpdateRequest, ip="tcp")
+_GAME_PAYLOADS = (
+    (ChatMessage, "chat", "tcp"),
+    (ClientDetails, "notice_players", "tcp"),
+    (ClientDisconnect, "notice_players", "tcp"),
+    (ConsoleMessage, "chat", "tcp"),
+    (DownloadingFile, "download_files", "tcp"),
+    (DownloadRequest, "download_files", "tcp"),
+    (EndOfLevel, None, "tcp"),
+    (GameEvent, None, "udp"),
+    (GameInit, None, "tcp"),
+    (GameState, None, "udp"),
+    (Heartbeat, None, "udp"),
+    (PlayerList, "notice_players", "tcp"),
+    (JoinRequest, None, "tcp"),
+    (Latency, "update_latencies", "tcp"),
+    (LevelLoad, None, "tcp"),
+    # (Password, "passwords", "udp"),
+    # (PasswordCheck, "passwords", "udp"),
+    (Ping, None, "udp"),
+    (PlusAcknowledgement, "latest_plus", "tcp"),
+    (Pong, None, "udp"),
+    (Query, None, "udp"),
+    (QueryReply, None, "udp"),
+    (ResourceList, None, "tcp"),
+    (ServerDetails, None, "tcp"),
+    (ServerStopped, None, "tcp"),
+    (Spectate, "spectating", "tcp"),
+    (SpectateRequest, "spectating", "tcp"),
+    (UpdateEvents, None, "tcp"),
+    (Ready, None, "tcp"),
+    (UpdateRequest, None, "tcp"),
+)
+
+
+def _register_game_payloads(registry):
+    conditions = {}
+    for payload_cls, config_key, ip in registry:
+        condition = None
+        if config_key:
+            condition = conditions.get(config_key)
+            if condition is None:
+                condition = If.configured(**{config_key: True})
+                conditions[config_key] = condition
+        GameProtocol.register(payload_cls, condition, ip=ip)
+
+
+_register_game_payloads(_GAME_PAYLOADS)
+
+
+def compile_payload_structs(payload_cls=GamePayload):
+    """Compile payload structs upfront instead of on their first parse."""
+    if issubclass(payload_cls, BinaryPayload):
+        payload_cls.compile_struct()
+    for impl_cls in payload_cls.impls.values():
+        compile_payload_structs(impl_cls)
 
 
 @GameProtocol.handles(ALL_PAYLOADS, If.configured(bot=True))
@@ -1161,6 +1667,40 @@ class BotProtocol(Protocol, extends=GameProtocol):
         self.submit(UpdateRequest.from_dict(self.session))
 
 
+class _TCPProtocol(asyncio.Protocol):
+    def __init__(self, protocol: GameProtocol):
+        self.protocol = protocol
+
+    def connection_made(self, transport):
+        self.protocol.tcp_connection_made(transport)
+
+    def connection_lost(self, exc):
+        self.protocol.connection_lost(exc)
+
+    def data_received(self, data):
+        self.protocol.data_received(data)
+
+    def eof_received(self):
+        return self.protocol.eof_received()
+
+
+class _UDPProtocol(asyncio.DatagramProtocol):
+    def __init__(self, protocol: GameProtocol):
+        self.protocol = protocol
+
+    def connection_made(self, transport):
+        self.protocol.udp_connection_made(transport)
+
+    def connection_lost(self, exc):
+        self.protocol.connection_lost(exc)
+
+    def datagram_received(self, data, addr):
+        self.protocol.datagram_received(data, addr)
+
+    def error_received(self, exc):
+        self.protocol.error_received(exc)
+
+
 class GameClient(Client):
     def __init__(self, local_players, **config):
         config["from_server"] = True
@@ -1179,8 +1719,10 @@ class GameClient(Client):
             engine=self, future=self.loop.create_future(), **self.config
         )
         protocol.session.local_players = self.local_players
-        await self.loop.create_connection(lambda: protocol, host=host, port=port)
+        tcp_protocol = _TCPProtocol(protocol)
+        udp_protocol = _UDPProtocol(protocol)
+        await self.loop.create_connection(lambda: tcp_protocol, host=host, port=port)
         await self.loop.create_datagram_endpoint(
-            lambda: protocol, remote_addr=(host, port)
+            lambda: udp_protocol, remote_addr=(host, port)
         )
         return self.register_protocol((host, port), protocol)